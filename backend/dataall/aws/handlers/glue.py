@@ -15,6 +15,7 @@ class Glue:
         pass
 
     @staticmethod
+    @Worker.retry_on_error_codes(logger=log)
     def create_database(accountid, database, region, location):
         try:
             existing_database = Glue.database_exists(
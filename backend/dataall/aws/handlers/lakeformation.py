@@ -3,6 +3,7 @@ import uuid
 
 from botocore.exceptions import ClientError
 
+from .service_handlers import Worker
 from .sts import SessionHelper
 
 log = logging.getLogger('aws:lakeformation')
@@ -36,7 +37,11 @@ class LakeFormation:
 
     @staticmethod
     def grant_pivot_role_all_database_permissions(accountid, region, database):
-        LakeFormation.grant_permissions_to_database(
+        """
+        Grants 'ALL' database permissions to the pivot role
+        Returns True if the grant succeeded
+        """
+        return LakeFormation.grant_permissions_to_database(
             client=SessionHelper.remote_session(accountid=accountid).client(
                 'lakeformation', region_name=region
             ),
@@ -45,6 +50,61 @@ class LakeFormation:
             permissions=['ALL'],
         )
 
+    @staticmethod
+    def batch_grant_pivot_role_database_permissions(databases):
+        """
+        Grants 'ALL' database permissions to the pivot role on a set of databases,
+        using one BatchGrantPermissions call per account/region and 20 entries
+        :param databases: iterable of (accountid, region, database) tuples
+        :return: set of (accountid, region, database) tuples that were granted
+        """
+        databases_by_catalog = {}
+        for accountid, region, database in set(databases):
+            databases_by_catalog.setdefault((accountid, region), []).append(database)
+
+        granted = set()
+        for (accountid, region), database_names in databases_by_catalog.items():
+            client = SessionHelper.remote_session(accountid=accountid).client(
+                'lakeformation', region_name=region
+            )
+            principal = SessionHelper.get_delegation_role_arn(accountid)
+            entries = [
+                {
+                    'Id': str(uuid.uuid4()),
+                    'Principal': {'DataLakePrincipalIdentifier': principal},
+                    'Resource': {'Database': {'Name': database_name}},
+                    'Permissions': ['ALL'],
+                }
+                for database_name in sorted(database_names)
+            ]
+            entries_chunks = [entries[i : i + 20] for i in range(0, len(entries), 20)]
+            for entries_chunk in entries_chunks:
+                try:
+                    response = client.batch_grant_permissions(
+                        CatalogId=accountid, Entries=entries_chunk
+                    )
+                except ClientError as e:
+                    log.error(
+                        f'Could not batch grant pivot role permissions on databases '
+                        f'{[entry["Resource"]["Database"]["Name"] for entry in entries_chunk]} '
+                        f'in {accountid}/{region} due to: {e}'
+                    )
+                    continue
+                failed_ids = {failure['RequestEntry']['Id'] for failure in response.get('Failures', [])}
+                if failed_ids:
+                    log.warning(f'Batch Grant ended with failures: {response.get("Failures")}')
+                granted.update(
+                    (accountid, region, entry['Resource']['Database']['Name'])
+                    for entry in entries_chunk
+                    if entry['Id'] not in failed_ids
+                )
+        return granted
+
+    @staticmethod
+    @Worker.retry_on_error_codes(logger=log)
+    def _grant_permissions(client, **grant):
+        return client.grant_permissions(**grant)
+
     @staticmethod
     def grant_permissions_to_database(
         client,
@@ -53,12 +113,18 @@ class LakeFormation:
         permissions,
         permissions_with_grant_options=None,
     ):
+        """
+        Grants database permissions to each principal, logging failures
+        Returns True if all the grants succeeded
+        """
+        granted = True
         for principal in principals:
             log.info(
                 f'Granting database permissions {permissions} to {principal} on database {database_name}'
             )
             try:
-                client.grant_permissions(
+                LakeFormation._grant_permissions(
+                    client,
                     Principal={'DataLakePrincipalIdentifier': principal},
                     Resource={
                         'Database': {'Name': database_name},
@@ -75,6 +141,8 @@ class LakeFormation:
                     f'principal {principal} '
                     f'{permissions} to database {database_name} due to: {e}'
                 )
+                granted = False
+        return granted
 
     @staticmethod
     def grant_permissions_to_table(
@@ -4,6 +4,7 @@ import os
 import ast
 
 from botocore.exceptions import ClientError
+from .service_handlers import Worker
 from .sts import SessionHelper
 from .secrets_manager import SecretsManager
 from .parameter_store import ParameterStoreManager
@@ -104,6 +105,7 @@ class Quicksight:
         return False
 
     @staticmethod
+    @Worker.retry_on_error_codes(logger=logger)
     def create_quicksight_group(AwsAccountId, GroupName=_DEFAULT_GROUP_NAME):
         """Creates a Quicksight group called GroupName
         Args:
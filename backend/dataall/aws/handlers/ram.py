@@ -1,8 +1,10 @@
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from botocore.exceptions import ClientError
 
+from .service_handlers import Worker
 from .sts import SessionHelper
 
 log = logging.getLogger('aws:ram')
@@ -186,40 +188,60 @@ class Ram:
         except ClientError as e:
             log.error(f'Failed cleaning RAM resource shares due to: {e} ')
 
+    @staticmethod
+    @Worker.retry_on_error_codes(logger=log)
+    def _delete_resource_share(client, resource_share_arn):
+        return client.delete_resource_share(resourceShareArn=resource_share_arn)
+
+    @staticmethod
+    def _delete_lakeformation_v1_resource_share(client, resource_share_arn):
+        try:
+            Ram._delete_resource_share(client, resource_share_arn)
+            return True
+        except ClientError as e:
+            log.error(f'Failed deleting LF V1 RAM resource share {resource_share_arn} due to: {e}')
+            return False
+
     @staticmethod
     def delete_lakeformation_v1_resource_shares(client):
         log.info('Cleaning LF V1 RAM resource shares...')
 
         try:
-            resources = []
+            resource_share_arns = set()
             paginator = client.get_paginator('list_resources').paginate(
                 resourceOwner='SELF',
                 resourceRegionScope='REGIONAL',
             )
             for page in paginator:
-                resources.extend(page['resources'])
-
-            log.info(f'Found resources : {len(resources)}')
-            resource_shares = []
-            for r in resources:
-                paginator = client.get_paginator('get_resource_shares').paginate(
-                    resourceShareArns=[r['resourceShareArn']],
-                    resourceOwner='SELF',
-                )
-                for page in paginator:
-                    resource_shares.extend(page['resourceShares'])
-                for rs in resource_shares:
+                resource_share_arns.update(r['resourceShareArn'] for r in page['resources'])
+
+            log.info(f'Found resource shares with resources : {len(resource_share_arns)}')
+            lfv1_resource_share_arns = []
+            paginator = client.get_paginator('get_resource_shares').paginate(
+                resourceOwner='SELF',
+            )
+            for page in paginator:
+                for rs in page['resourceShares']:
                     if (
-                        'LakeFormation' in rs['name']
+                        rs['resourceShareArn'] in resource_share_arns
+                        and 'LakeFormation' in rs['name']
                         and 'LakeFormation-V2' not in rs['name']
                     ):
                         log.info(
                             f"Found lakeformation V1 RAM association: {rs['name']}."
                             'Deleting it ...'
                         )
-                        client.delete_resource_share(
-                            resourceShareArn=r['resourceShareArn']
-                        )
+                        lfv1_resource_share_arns.append(rs['resourceShareArn'])
+
+            # Each share is retried on throttling on its own, a failed share does not stop the others
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                deleted = list(
+                    executor.map(
+                        lambda arn: Ram._delete_lakeformation_v1_resource_share(client, arn),
+                        lfv1_resource_share_arns,
+                    )
+                )
+            log.info(f'Deleted {sum(deleted)}/{len(deleted)} LF V1 RAM resource shares')
 
         except ClientError as e:
             log.error(f'Failed cleaning RAM resource shares due to: {e} ')
@@ -1,13 +1,21 @@
 import logging
 import os
+import random
 import time
 from functools import wraps
 
+from botocore.exceptions import ClientError
+
 from ...db.models import Task
 from ...utils.json_utils import to_json
 
 log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
+TRANSIENT_ERROR_CODES = (
+    'ThrottlingException',
+    'ConcurrentModificationException',
+    'RequestLimitExceeded',
+)
 
 
 class WorkerHandler:
@@ -146,5 +154,46 @@ class WorkerHandler:
 
         return deco_retry
 
+    @classmethod
+    def retry_on_error_codes(cls, codes=TRANSIENT_ERROR_CODES, tries=4, delay=1, logger=None):
+        """
+        Retry calling the decorated function when it raises a botocore ClientError
+        with one of the given error codes, using an exponential backoff with full jitter.
+        Other errors are raised straight away.
+        :param codes: error codes to retry on
+        :type codes: tuple
+        :param tries: number of times to try (not retry) before giving up
+        :type tries: int
+        :param delay: initial maximum delay between retries in seconds, doubled each retry
+        :type delay: float
+        :param logger: logger to use. If None, print
+        :type logger: logging.Logger instance
+        """
+
+        def deco_retry(f):
+            @wraps(f)
+            def f_retry(*args, **kwargs):
+                mtries, mdelay = tries, delay
+                while mtries > 1:
+                    try:
+                        return f(*args, **kwargs)
+                    except ClientError as e:
+                        if e.response.get('Error', {}).get('Code') not in codes:
+                            raise e
+                        sleep = random.uniform(0, mdelay)
+                        msg = f'Transient error {e} was raised. Retrying in {sleep:.2f} seconds...'
+                        if logger:
+                            logger.warning(msg)
+                        else:
+                            print(msg)
+                        time.sleep(sleep)
+                        mtries -= 1
+                        mdelay *= 2
+                return f(*args, **kwargs)
+
+            return f_retry
+
+        return deco_retry
+
 
 Worker = WorkerHandler.get_instance()
@@ -1,7 +1,13 @@
+import hashlib
+import json
 import logging
 import os
 import shutil
+import stat
 import subprocess
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 
@@ -20,12 +26,28 @@ from .manager import stack
 from ...aws.handlers.sts import SessionHelper
 from ... import db
 from ...db import models
-from ...db.api import Environment, Pipeline, Dataset
+from ...db.api import Pipeline, Dataset
 from ...utils.cdk_nag_utils import CDKNagUtil
 from ...utils.runtime_stacks_tagging import TagsUtil
 
 logger = logging.getLogger(__name__)
 
+_BLUEPRINT_DIR = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "blueprints", "data_pipeline_blueprint")
+)
+_DEPLOY_BUILDSPEC_TEMPLATE = os.path.join(_BLUEPRINT_DIR, "templates", "deploy_buildspec.yaml")
+_ZIP_CACHE_DIR = os.path.join(tempfile.gettempdir(), f"dataall-pipeline-blueprints-{os.getuid()}")
+
+
+def _private_cache_dir():
+    """Returns the archive cache directory, or None if it is not private to the current user"""
+    os.makedirs(_ZIP_CACHE_DIR, mode=0o700, exist_ok=True)
+    st = os.lstat(_ZIP_CACHE_DIR)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        logger.warning("Not using archive cache %s, it is not private to the current user", _ZIP_CACHE_DIR)
+        return None
+    return _ZIP_CACHE_DIR
+
 
 @stack("pipeline")
 class PipelineStack(Stack):
@@ -46,39 +68,13 @@ class PipelineStack(Stack):
 
     module_name = __file__
 
-    def get_engine(self):
-        envname = os.environ.get("envname", "local")
-        engine = db.get_engine(envname=envname)
-        return engine
-
-    def get_target(self, target_uri) -> models.DataPipeline:
-        engine = self.get_engine()
-        with engine.scoped_session() as session:
-            return Pipeline.get_pipeline_by_uri(session, target_uri)
-
-    def get_pipeline_environments(self, targer_uri) -> models.DataPipelineEnvironment:
-        engine = self.get_engine()
-        with engine.scoped_session() as session:
-            envs = Pipeline.query_pipeline_environments(
-                session, targer_uri
-            )
-        return envs
-
-    def get_pipeline_cicd_environment(
-        self, pipeline: models.DataPipeline
-    ) -> models.Environment:
-        envname = os.environ.get("envname", "local")
-        engine = db.get_engine(envname=envname)
-        with engine.scoped_session() as session:
-            return Environment.get_environment_by_uri(session, pipeline.environmentUri)
+    _engine = None
 
-    def get_env_team(self, pipeline: models.DataPipeline) -> models.EnvironmentGroup:
-        engine = self.get_engine()
-        with engine.scoped_session() as session:
-            env = Environment.get_environment_group(
-                session, pipeline.SamlGroupName, pipeline.environmentUri
-            )
-        return env
+    def get_engine(self):
+        if self._engine is None:
+            envname = os.environ.get("envname", "local")
+            self._engine = db.get_engine(envname=envname)
+        return self._engine
 
     def get_dataset(self, dataset_uri) -> models.Dataset:
         engine = self.get_engine()
@@ -88,8 +84,20 @@ class PipelineStack(Stack):
             )
         return ds
 
+    def get_stack_context(self, target_uri):
+        with self.get_engine().scoped_session() as session:
+            return Pipeline.get_stack_context(session, target_uri)
+
     def __init__(self, scope, id, target_uri: str = None, **kwargs):
         kwargs.setdefault("tags", {}).update({"utility": "dataall-data-pipeline"})
+
+        (
+            pipeline,
+            pipeline_environment,
+            pipeline_env_team,
+            development_environments,
+        ) = self.get_stack_context(target_uri=target_uri)
+
         super().__init__(
             scope,
             id,
@@ -97,9 +105,9 @@ class PipelineStack(Stack):
             stack_name=kwargs.get("stack_name"),
             tags=kwargs.get("tags"),
             description="Cloud formation stack of PIPELINE: {}; URI: {}; DESCRIPTION: {}".format(
-                self.get_target(target_uri=target_uri).label,
+                pipeline.label,
                 target_uri,
-                self.get_target(target_uri=target_uri).description,
+                pipeline.description,
             )[
                 :1024
             ],
@@ -107,12 +115,6 @@ class PipelineStack(Stack):
 
         # Configuration
         self.target_uri = target_uri
-
-        pipeline = self.get_target(target_uri=target_uri)
-        pipeline_environment = self.get_pipeline_cicd_environment(pipeline=pipeline)
-        pipeline_env_team = self.get_env_team(pipeline=pipeline)
-        # Development environments
-        development_environments = self.get_pipeline_environments(targer_uri=target_uri)
         self.devStages = [env.stage for env in development_environments]
 
         # Support resources
@@ -164,68 +166,60 @@ class PipelineStack(Stack):
         )
 
         # Create CodeCommit repository and mirror blueprint code
-        code_dir_path = os.path.realpath(
-            os.path.abspath(
-                os.path.join(
-                    __file__, "..", "..", "..", "..", "blueprints", "data_pipeline_blueprint"
-                )
-            )
-        )
+        with tempfile.TemporaryDirectory(prefix=f"ddkblueprint-{pipeline.repo}-") as code_dir_path:
+            shutil.copytree(_BLUEPRINT_DIR, code_dir_path, dirs_exist_ok=True)
 
-        try:
-            env_vars, aws = PipelineStack._set_env_vars(pipeline_environment)
+            aws = SessionHelper.remote_session(pipeline_environment.AwsAccountId)
             codecommit_client = aws.client('codecommit', region_name=pipeline_environment.region)
             repository = PipelineStack._check_repository(codecommit_client, pipeline.repo)
             if repository:
                 PipelineStack.write_ddk_json_multienvironment(path=code_dir_path, output_file="ddk.json", pipeline_environment=pipeline_environment, development_environments=development_environments)
 
-                logger.info(f"Pipeline Repo {pipeline.repo} Exists...Handling Update")
-                update_cmds = [
-                    f'REPO_NAME={pipeline.repo}',
-                    'COMMITID=$(aws codecommit get-branch --repository-name ${REPO_NAME} --branch-name main --query branch.commitId --output text)',
-                    'aws codecommit put-file --repository-name ${REPO_NAME} --branch-name main --file-content file://ddk.json --file-path ddk.json --parent-commit-id ${COMMITID} --cli-binary-format raw-in-base64-out',
-                ]
-
-                process = subprocess.run(
-                    "; ".join(update_cmds),
-                    text=True,
-                    shell=True,  # nosec
-                    encoding='utf-8',
-                    cwd=code_dir_path,
-                    env=env_vars
+                logger.info("Pipeline Repo %s Exists...Handling Update", pipeline.repo)
+                PipelineStack.update_repo_file(
+                    codecommit_client=codecommit_client,
+                    repo_name=pipeline.repo,
+                    path=code_dir_path,
+                    file_path="ddk.json",
                 )
             else:
-                raise Exception
-        except Exception as e:
-            PipelineStack.initialize_repo(pipeline, code_dir_path)
+                PipelineStack.initialize_repo(pipeline, code_dir_path)
 
-            PipelineStack.write_deploy_buildspec(path=code_dir_path, output_file=f"{pipeline.repo}/deploy_buildspec.yaml")
+                PipelineStack.write_deploy_buildspec(path=code_dir_path, output_file=f"{pipeline.repo}/deploy_buildspec.yaml")
 
-            PipelineStack.write_ddk_json_multienvironment(path=code_dir_path, output_file=f"{pipeline.repo}/ddk.json", pipeline_environment=pipeline_environment, development_environments=development_environments)
+                PipelineStack.write_ddk_json_multienvironment(path=code_dir_path, output_file=f"{pipeline.repo}/ddk.json", pipeline_environment=pipeline_environment, development_environments=development_environments)
 
-            logger.info(f"Pipeline Repo {pipeline.repo} Does Not Exists... Creating Repository")
+                logger.info("Pipeline Repo %s Does Not Exists... Creating Repository", pipeline.repo)
 
-            PipelineStack.cleanup_zip_directory(code_dir_path)
+                PipelineStack.zip_directory(os.path.join(code_dir_path, pipeline.repo))
+                code_asset = Asset(
+                    scope=self, id=f"{pipeline.name}-asset", path=f"{code_dir_path}/{pipeline.repo}/code.zip"
+                )
 
-            PipelineStack.zip_directory(os.path.join(code_dir_path, pipeline.repo))
-            code_asset = Asset(
-                scope=self, id=f"{pipeline.name}-asset", path=f"{code_dir_path}/{pipeline.repo}/code.zip"
-            )
+                code = codecommit.CfnRepository.CodeProperty(
+                    s3=codecommit.CfnRepository.S3Property(
+                        bucket=code_asset.s3_bucket_name,
+                        key=code_asset.s3_object_key,
+                    )
+                )
 
-            code = codecommit.CfnRepository.CodeProperty(
-                s3=codecommit.CfnRepository.S3Property(
-                    bucket=code_asset.s3_bucket_name,
-                    key=code_asset.s3_object_key,
+                repository = codecommit.CfnRepository(
+                    scope=self,
+                    code=code,
+                    id="CodecommitRepository",
+                    repository_name=pipeline.repo,
                 )
-            )
+                repository.apply_removal_policy(RemovalPolicy.RETAIN)
 
-            repository = codecommit.CfnRepository(
-                scope=self,
-                code=code,
-                id="CodecommitRepository",
-                repository_name=pipeline.repo,
-            )
-            repository.apply_removal_policy(RemovalPolicy.RETAIN)
+        source_repository = codecommit.Repository.from_repository_name(
+            self, 'source_blueprint_repo', repository_name=pipeline.repo
+        )
+        build_image = codebuild.LinuxBuildImage.AMAZON_LINUX_2_3
+        build_spec = codebuild.BuildSpec.from_source_filename("deploy_buildspec.yaml")
+        common_env_vars = PipelineStack.make_common_environment_variables(
+            pipeline=pipeline,
+            stages=self.devStages
+        )
 
         if pipeline.devStrategy == "trunk":
             codepipeline_pipeline = codepipeline.Pipeline(
@@ -245,31 +239,28 @@ class PipelineStack(Stack):
                         branch='main',
                         output=self.source_artifact,
                         trigger=codepipeline_actions.CodeCommitTrigger.POLL,
-                        repository=codecommit.Repository.from_repository_name(
-                            self, 'source_blueprint_repo', repository_name=pipeline.repo
-                        ),
+                        repository=source_repository,
                     )
                 ],
             )
 
+            stages_count = len(development_environments)
             for env in sorted(development_environments, key=lambda env: env.order):
-                buildspec = "deploy_buildspec.yaml"
                 build_project = codebuild.PipelineProject(
                     scope=self,
                     id=f'{pipeline.name}-build-{env.stage}',
                     environment=codebuild.BuildEnvironment(
                         privileged=True,
-                        build_image=codebuild.LinuxBuildImage.AMAZON_LINUX_2_3,
+                        build_image=build_image,
                         environment_variables=PipelineStack.make_environment_variables(
-                            pipeline=pipeline,
+                            common_env_vars=common_env_vars,
                             pipeline_environment=env,
                             pipeline_env_team=env.samlGroupName,
                             stage=env.stage,
-                            stages=self.devStages
                         ),
                     ),
                     role=build_project_role,
-                    build_spec=codebuild.BuildSpec.from_source_filename(buildspec),
+                    build_spec=build_spec,
                     encryption_key=self.codebuild_key,
                 )
 
@@ -286,7 +277,7 @@ class PipelineStack(Stack):
                 )
 
                 # Skip manual approval for one stage pipelines and for last stage
-                if env.order < development_environments.count():
+                if env.order < stages_count:
                     self.codepipeline_pipeline.add_stage(
                         stage_name=f'ManualApproval-{env.stage}',
                         actions=[
@@ -297,10 +288,10 @@ class PipelineStack(Stack):
                     )
 
         else:
+            # Stages are built serially on purpose: every construct call goes through the
+            # single jsii kernel process, which does not support concurrent requests
             for env in development_environments:
                 branch_name = 'main' if (env.stage == 'prod') else env.stage
-                buildspec = "deploy_buildspec.yaml"
-
                 codepipeline_pipeline = codepipeline.Pipeline(
                     scope=self,
                     id=f"{pipeline.name}-{env.stage}",
@@ -318,9 +309,7 @@ class PipelineStack(Stack):
                             branch=branch_name,
                             output=self.source_artifact,
                             trigger=codepipeline_actions.CodeCommitTrigger.POLL,
-                            repository=codecommit.Repository.from_repository_name(
-                                self, f'source_blueprint_repo_{env.stage}', repository_name=pipeline.repo
-                            ),
+                            repository=source_repository,
                         )
                     ],
                 )
@@ -330,17 +319,16 @@ class PipelineStack(Stack):
                     id=f'{pipeline.name}-build-{env.stage}',
                     environment=codebuild.BuildEnvironment(
                         privileged=True,
-                        build_image=codebuild.LinuxBuildImage.AMAZON_LINUX_2_3,
+                        build_image=build_image,
                         environment_variables=PipelineStack.make_environment_variables(
-                            pipeline=pipeline,
+                            common_env_vars=common_env_vars,
                             pipeline_environment=env,
                             pipeline_env_team=env.samlGroupName,
                             stage=env.stage,
-                            stages=self.devStages
                         ),
                     ),
                     role=build_project_role,
-                    build_spec=codebuild.BuildSpec.from_source_filename(buildspec),
+                    build_spec=build_spec,
                     encryption_key=self.codebuild_key,
                 )
 
@@ -374,75 +362,98 @@ class PipelineStack(Stack):
 
         CDKNagUtil.check_rules(self)
 
-        PipelineStack.cleanup_zip_directory(code_dir_path)
-        PipelineStack.cleanup_pipeline_directory(os.path.join(code_dir_path, pipeline.repo))
-
     @staticmethod
     def zip_directory(path):
+        zip_path = os.path.join(path, "code.zip")
         try:
-            shutil.make_archive("code", "zip", path)
-            shutil.move("code.zip", f"{path}/code.zip")
+            files = []
+            for root, dirs, filenames in os.walk(path):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    full_path = os.path.join(root, filename)
+                    if full_path != zip_path:
+                        files.append(full_path)
+
+            def read_file(full_path):
+                with open(full_path, "rb") as f:
+                    return full_path, f.read()
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                contents = list(executor.map(read_file, files))
+
+            digest = hashlib.sha256()
+            for full_path, content in contents:
+                digest.update(os.path.relpath(full_path, path).encode())
+                digest.update(hashlib.sha256(content).digest())
+            content_digest = digest.hexdigest()
+
+            # Reusing the previous archive keeps the asset hash stable, so CDK skips the upload.
+            # The content digest is stored as the archive comment and checked before reuse.
+            cache_dir = _private_cache_dir()
+            cached_zip_path = cache_dir and os.path.join(cache_dir, f"{os.path.basename(path)}.zip")
+            if cached_zip_path and os.path.isfile(cached_zip_path):
+                try:
+                    with zipfile.ZipFile(cached_zip_path) as zf:
+                        cached_digest = zf.comment.decode()
+                except zipfile.BadZipFile:
+                    cached_digest = None
+                if cached_digest == content_digest:
+                    logger.info("Blueprint unchanged, reusing %s", cached_zip_path)
+                    shutil.copyfile(cached_zip_path, zip_path)
+                    return
+
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                zf.comment = content_digest.encode()
+                for full_path, content in contents:
+                    zinfo = zipfile.ZipInfo.from_file(full_path, os.path.relpath(full_path, path))
+                    zf.writestr(zinfo, content, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+
+            if cached_zip_path:
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".zip.tmp")
+                try:
+                    with os.fdopen(fd, "wb") as tmp, open(zip_path, "rb") as src:
+                        shutil.copyfileobj(src, tmp)
+                    os.replace(tmp_path, cached_zip_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
         except Exception as e:
-            logger.error(f"Failed to zip repository due to: {e}")
-
-    @staticmethod
-    def cleanup_zip_directory(path):
-        if os.path.isfile(f"{path}/code.zip"):
-            os.remove(f"{path}/code.zip")
-        else:
-            logger.info("Info: %s Zip not found" % f"{path}/code.zip")
-
-    @staticmethod
-    def cleanup_pipeline_directory(path):
-        if os.path.isdir(path):
-            shutil.rmtree(path)
-        else:
-            logger.info("Info: %s Directory not found" % f"{path}")
+            logger.error("Failed to zip repository due to: %s", e)
 
     @staticmethod
-    def make_environment_variables(
+    def make_common_environment_variables(
         pipeline,
-        pipeline_environment,
-        pipeline_env_team,
-        stage,
         stages
     ):
-
-        env_vars_1 = {
+        return {
             "PIPELINE_URI": codebuild.BuildEnvironmentVariable(value=pipeline.DataPipelineUri),
             "PIPELINE_NAME": codebuild.BuildEnvironmentVariable(value=pipeline.name),
-            "STAGE": codebuild.BuildEnvironmentVariable(value=stage),
             "DEV_STAGES": codebuild.BuildEnvironmentVariable(value=stages),
             "DEV_STRATEGY": codebuild.BuildEnvironmentVariable(value=pipeline.devStrategy),
             "TEMPLATE": codebuild.BuildEnvironmentVariable(value=pipeline.template),
+        }
+
+    @staticmethod
+    def make_environment_variables(
+        common_env_vars,
+        pipeline_environment,
+        pipeline_env_team,
+        stage
+    ):
+        return {
+            **common_env_vars,
+            "STAGE": codebuild.BuildEnvironmentVariable(value=stage),
             "ENVIRONMENT_URI": codebuild.BuildEnvironmentVariable(value=pipeline_environment.environmentUri),
             "AWSACCOUNTID": codebuild.BuildEnvironmentVariable(value=pipeline_environment.AwsAccountId),
             "AWSREGION": codebuild.BuildEnvironmentVariable(value=pipeline_environment.region),
             "ENVTEAM_ROLENAME": codebuild.BuildEnvironmentVariable(value=pipeline_env_team),
         }
-        env_vars = dict(env_vars_1)
-        return env_vars
 
     @staticmethod
     def write_deploy_buildspec(path, output_file):
-        yaml = """
-            version: '0.2'
-            env:
-                git-credential-helper: yes
-            phases:
-              pre_build:
-                commands:
-                - n 16.15.1
-                - npm install -g aws-cdk
-                - pip install aws-ddk
-                - pip install -r requirements.txt
-              build:
-                commands:
-                    - aws sts get-caller-identity
-                    - ddk deploy
-        """
-        with open(f'{path}/{output_file}', 'x') as text_file:
-            print(yaml, file=text_file)
+        output_path = f'{path}/{output_file}'
+        shutil.copyfile(_DEPLOY_BUILDSPEC_TEMPLATE, f'{output_path}.tmp')
+        os.replace(f'{output_path}.tmp', output_path)
 
     @staticmethod
     def make_codebuild_policy_statements(
@@ -483,88 +494,87 @@ class PipelineStack(Stack):
 
     @staticmethod
     def write_ddk_json_multienvironment(path, output_file, pipeline_environment, development_environments):
-        json_envs = ""
+        environments = {
+            "cicd": {
+                "account": pipeline_environment.AwsAccountId,
+                "region": pipeline_environment.region,
+                "stage": "cicd",
+            }
+        }
         for env in development_environments:
-            json_env = f""",
-        "{env.stage}": {{
-            "account": "{env.AwsAccountId}",
-            "region": "{env.region}",
-            "stage": "{env.stage}",
-            "env_vars": {{
-                "database": "example_database",
-                "Team": "{env.samlGroupName}"
-            }}
-        }}"""
-            json_envs = json_envs + json_env
-
-        json = f"""{{
-    "environments": {{
-        "cicd": {{
-            "account": "{pipeline_environment.AwsAccountId}",
-            "region": "{pipeline_environment.region}",
-            "stage": "cicd"
-        }}{json_envs}
-    }}
-}}"""
-
-        with open(f'{path}/{output_file}', 'w') as text_file:
-            print(json, file=text_file)
+            environments[env.stage] = {
+                "account": env.AwsAccountId,
+                "region": env.region,
+                "stage": env.stage,
+                "env_vars": {
+                    "database": "example_database",
+                    "Team": env.samlGroupName,
+                },
+            }
+
+        output_path = f'{path}/{output_file}'
+        with open(f'{output_path}.tmp', 'w') as text_file:
+            json.dump({"environments": environments}, text_file, indent=4)
+            text_file.write('\n')
+        os.replace(f'{output_path}.tmp', output_path)
 
+    @staticmethod
     def initialize_repo(pipeline, code_dir_path):
+        repo_dir_path = os.path.join(code_dir_path, pipeline.repo)
+        cmd_init = ["ddk", "init", pipeline.repo, "--generate-only"]
 
-        venv_name = ".venv"
-
-        cmd_init = [
-            f"ddk init {pipeline.repo} --generate-only",
-            f"cp app_multiaccount.py ./{pipeline.repo}/app.py",
-            f"cp ddk_app/ddk_app_stack_multiaccount.py ./{pipeline.repo}/ddk_app/ddk_app_stack.py",
-            f"mkdir ./{pipeline.repo}/utils",
-            f"cp -R utils/* ./{pipeline.repo}/utils/"
-        ]
-
-        logger.info(f"Running Commands: {'; '.join(cmd_init)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Running Command: %s", " ".join(cmd_init))
 
-        process = subprocess.run(
-            '; '.join(cmd_init),
+        subprocess.run(
+            cmd_init,
             text=True,
-            shell=True,  # nosec
             encoding='utf-8',
-            cwd=code_dir_path
+            cwd=code_dir_path,
+            check=True,
+        )
+        shutil.copy(
+            os.path.join(code_dir_path, "app_multiaccount.py"),
+            os.path.join(repo_dir_path, "app.py"),
+        )
+        shutil.copy(
+            os.path.join(code_dir_path, "ddk_app", "ddk_app_stack_multiaccount.py"),
+            os.path.join(repo_dir_path, "ddk_app", "ddk_app_stack.py"),
+        )
+        shutil.copytree(
+            os.path.join(code_dir_path, "utils"),
+            os.path.join(repo_dir_path, "utils"),
+            dirs_exist_ok=True,
         )
-        if process.returncode == 0:
-            logger.info("Successfully Initialized New CDK/DDK App")
-            return
+        logger.info("Successfully Initialized New CDK/DDK App")
 
     @staticmethod
-    def _set_env_vars(pipeline_environment):
-        aws = SessionHelper.remote_session(pipeline_environment.AwsAccountId)
-        env_creds = aws.get_credentials()
-
-        env = {
-            'AWS_REGION': pipeline_environment.region,
-            'AWS_DEFAULT_REGION': pipeline_environment.region,
-            'CURRENT_AWS_ACCOUNT': pipeline_environment.AwsAccountId,
-            'envname': os.environ.get('envname', 'local'),
-        }
-        if env_creds:
-            env.update(
-                {
-                    'AWS_ACCESS_KEY_ID': env_creds.access_key,
-                    'AWS_SECRET_ACCESS_KEY': env_creds.secret_key,
-                    'AWS_SESSION_TOKEN': env_creds.token
-                }
+    def update_repo_file(codecommit_client, repo_name, path, file_path, branch_name="main"):
+        branch = codecommit_client.get_branch(repositoryName=repo_name, branchName=branch_name)
+        with open(os.path.join(path, file_path), "rb") as f:
+            file_content = f.read()
+        try:
+            codecommit_client.put_file(
+                repositoryName=repo_name,
+                branchName=branch_name,
+                fileContent=file_content,
+                filePath=file_path,
+                parentCommitId=branch["branch"]["commitId"],
             )
-        return env, aws
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'SameFileContentException':
+                raise e
+            logger.info("%s unchanged in repository %s, nothing to update", file_path, repo_name)
 
     @staticmethod
     def _check_repository(codecommit_client, repo_name):
         repository = None
-        logger.info(f"Checking Repository Exists: {repo_name}")
+        logger.info("Checking Repository Exists: %s", repo_name)
         try:
             repository = codecommit_client.get_repository(repositoryName=repo_name)
         except ClientError as e:
             if e.response['Error']['Code'] == 'RepositoryDoesNotExistException':
-                logger.debug(f'Repository does not exists {repo_name} %s', e)
+                logger.debug('Repository does not exists %s %s', repo_name, e)
             else:
                 raise e
         return repository if repository else None
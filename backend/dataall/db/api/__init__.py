@@ -17,7 +17,7 @@ from .dataset_table import DatasetTable
 from .notification import Notification
 from .redshift_cluster import RedshiftCluster
 from .vpc import Vpc
-from .share_object import ShareObject, ShareObjectSM, ShareItemSM
+from .share_object import ShareObject, ShareObjectSM, ShareItemSM, ShareData
 from .notebook import Notebook
 from .sgm_studio_notebook import SgmStudioNotebook
 from .dashboard import Dashboard
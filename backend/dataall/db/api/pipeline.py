@@ -222,6 +222,40 @@ class Pipeline:
             raise exceptions.ObjectNotFound('Pipeline', uri)
         return pipeline
 
+    @staticmethod
+    def get_stack_context(session, uri):
+        context = (
+            session.query(models.DataPipeline, models.Environment, models.EnvironmentGroup)
+            .outerjoin(
+                models.Environment,
+                models.Environment.environmentUri == models.DataPipeline.environmentUri,
+            )
+            .outerjoin(
+                models.EnvironmentGroup,
+                and_(
+                    models.EnvironmentGroup.environmentUri == models.DataPipeline.environmentUri,
+                    models.EnvironmentGroup.groupUri == models.DataPipeline.SamlGroupName,
+                ),
+            )
+            .filter(models.DataPipeline.DataPipelineUri == uri)
+            .first()
+        )
+        if not context:
+            raise exceptions.ObjectNotFound('Pipeline', uri)
+        pipeline, environment, env_group = context
+        if not environment:
+            raise exceptions.ObjectNotFound(models.Environment.__name__, pipeline.environmentUri)
+        if not env_group:
+            raise exceptions.ObjectNotFound(
+                'EnvironmentGroup', f'({pipeline.SamlGroupName},{pipeline.environmentUri})'
+            )
+        development_environments = (
+            Pipeline.query_pipeline_environments(session, uri)
+            .order_by(models.DataPipelineEnvironment.order)
+            .all()
+        )
+        return pipeline, environment, env_group, development_environments
+
     @staticmethod
     def query_user_pipelines(session, username, groups, filter) -> Query:
         query = session.query(models.DataPipeline).filter(
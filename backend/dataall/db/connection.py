@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+import threading
 from contextlib import contextmanager
 
 import boto3
@@ -29,6 +30,8 @@ class Engine:
             dbconfig.url,
             echo=False,
             pool_size=1,
+            pool_recycle=3600,
+            pool_pre_ping=True,
             connect_args={'options': f"-csearch_path={dbconfig.params['schema']}"},
         )
         try:
@@ -46,15 +49,16 @@ class Engine:
             log.error(f'Could not create schema: {e}')
 
         self.sessions = {}
-        self._session = None
+        # One session per thread, so that tasks can run share operations concurrently
+        self._local = threading.local()
 
     def session(self):
-        if self._session is None:
-            self._session = sessionmaker(
+        if getattr(self._local, 'session', None) is None:
+            self._local.session = sessionmaker(
                 bind=self.engine, autoflush=True, expire_on_commit=False
             )()
 
-        return self._session
+        return self._local.session
 
     @contextmanager
     def scoped_session(self):
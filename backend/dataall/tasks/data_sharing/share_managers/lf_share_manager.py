@@ -17,6 +17,9 @@ logger = logging.getLogger(__name__)
 
 
 class LFShareManager:
+    # (accountid, region, database) keys on which the PivotRole was already granted in this process
+    granted_databases: set = set()
+
     def __init__(
         self,
         session,
@@ -81,7 +84,7 @@ class LFShareManager:
         -------
         Shared database name
         """
-        return (self.dataset.GlueDatabaseName + '_shared_' + self.share.shareUri)[:254]
+        return f'{self.dataset.GlueDatabaseName}_shared_{self.share.shareUri}'[:254]
 
     def build_share_data(self, table: models.DatasetTable) -> dict:
         """
@@ -143,13 +146,20 @@ class LFShareManager:
     def grant_pivot_role_all_database_permissions(self) -> bool:
         """
         Grants 'ALL' database Lake Formation permissions to data.all PivotRole
+        Skipped if already granted in this process, failed grants are tried again by the next share
         """
-        LakeFormation.grant_pivot_role_all_database_permissions(
+        key = (
             self.source_environment.AwsAccountId,
             self.source_environment.region,
             self.dataset.GlueDatabaseName,
         )
-        return True
+        if key in LFShareManager.granted_databases:
+            logger.info(f'PivotRole permissions already granted on {self.dataset.GlueDatabaseName}')
+            return True
+        granted = LakeFormation.grant_pivot_role_all_database_permissions(*key)
+        if granted:
+            LFShareManager.granted_databases.add(key)
+        return granted
 
     @classmethod
     def create_shared_database(
@@ -57,8 +57,8 @@ class ProcessLFSameAccountShare(LFShareManager):
         else:
             self.grant_pivot_role_all_database_permissions()
 
-            shared_db_name = self.build_shared_db_name()
-            principals = self.get_share_principals()
+            shared_db_name = self.shared_db_name
+            principals = self.principals
 
             self.create_shared_database(
                 self.target_environment, self.dataset, shared_db_name, principals
@@ -114,8 +114,8 @@ class ProcessLFSameAccountShare(LFShareManager):
         False if revoke fails
         """
         success = True
-        shared_db_name = self.build_shared_db_name()
-        principals = self.get_share_principals()
+        shared_db_name = self.shared_db_name
+        principals = self.principals
         for table in self.revoked_tables:
             share_item = api.ShareObject.find_share_item_by_table(
                 self.session, self.share, table
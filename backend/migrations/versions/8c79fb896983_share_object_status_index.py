@@ -0,0 +1,35 @@
+"""share object status index
+
+Revision ID: 8c79fb896983
+Revises: 509997f0a51e
+Create Date: 2026-10-15 22:40:12.311342
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8c79fb896983'
+down_revision = '509997f0a51e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Built concurrently so that share requests are not blocked while indexing
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_share_object_status_shareUri',
+            'share_object',
+            ['status', 'shareUri'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_share_object_status_shareUri',
+            table_name='share_object',
+            postgresql_concurrently=True,
+        )
@@ -1,9 +1,14 @@
 import json
+import os
+import zipfile
+from types import SimpleNamespace
 
 import pytest
 from aws_cdk import App
+from botocore.exceptions import ClientError
 
 from dataall.cdkproxy.stacks.pipeline import PipelineStack
+from dataall.db import api, exceptions, models
 
 
 @pytest.fixture(scope='function', autouse=True)
@@ -17,16 +22,20 @@ def patch_methods(mocker, db, pipeline2, env, pip_envs, org):
         return_value="dataall-pivot-role-name-pytest",
     )
     mocker.patch(
-        'dataall.cdkproxy.stacks.pipeline.PipelineStack.get_target',
-        return_value=pipeline2,
+        'dataall.aws.handlers.sts.SessionHelper.remote_session',
+        return_value=mocker.MagicMock(),
     )
     mocker.patch(
-        'dataall.cdkproxy.stacks.pipeline.PipelineStack.get_pipeline_cicd_environment',
-        return_value=env,
+        'dataall.cdkproxy.stacks.pipeline.PipelineStack._check_repository',
+        return_value=None,
     )
+    with db.scoped_session() as session:
+        env_team = api.Environment.get_environment_group(
+            session, pipeline2.SamlGroupName, env.environmentUri
+        )
     mocker.patch(
-        'dataall.cdkproxy.stacks.pipeline.PipelineStack.get_pipeline_environments',
-        return_value=pip_envs,
+        'dataall.cdkproxy.stacks.pipeline.PipelineStack.get_stack_context',
+        return_value=(pipeline2, env, env_team, pip_envs.all()),
     )
     mocker.patch(
         'dataall.utils.runtime_stacks_tagging.TagsUtil.get_engine', return_value=db
@@ -54,4 +63,135 @@ def template2(pipeline2):
 def test_resources_created_cp_trunk(template2):
     assert 'AWS::CodeCommit::Repository' in template2
     assert 'AWS::CodePipeline::Pipeline' in template2
-    assert 'AWS::CodeBuild::Project' in template2
\ No newline at end of file
+    assert 'AWS::CodeBuild::Project' in template2
+
+
+def test_resources_updated_cp_trunk(mocker, pipeline2):
+    codecommit_client = mocker.MagicMock()
+    codecommit_client.get_branch.return_value = {'branch': {'commitId': 'commit-id'}}
+    codecommit_client.put_file.side_effect = ClientError(
+        {'Error': {'Code': 'SameFileContentException', 'Message': 'same content'}}, 'PutFile'
+    )
+    mocker.patch(
+        'dataall.aws.handlers.sts.SessionHelper.remote_session',
+        return_value=mocker.MagicMock(client=mocker.MagicMock(return_value=codecommit_client)),
+    )
+    mocker.patch(
+        'dataall.cdkproxy.stacks.pipeline.PipelineStack._check_repository',
+        return_value={'repositoryMetadata': {'repositoryName': pipeline2.repo}},
+    )
+    app = App()
+    PipelineStack(app, 'PipelineUpdate', target_uri=pipeline2.DataPipelineUri)
+    template = json.dumps(app.synth().get_stack_by_name('PipelineUpdate').template)
+
+    codecommit_client.put_file.assert_called_once()
+    assert 'AWS::CodeCommit::Repository' not in template
+    assert 'AWS::CodePipeline::Pipeline' in template
+
+
+
+def test_get_stack_context(db, env, pipeline1):
+    with db.scoped_session() as session:
+        (
+            pipeline,
+            environment,
+            env_group,
+            development_environments,
+        ) = api.Pipeline.get_stack_context(session, pipeline1.DataPipelineUri)
+
+        assert pipeline.DataPipelineUri == pipeline1.DataPipelineUri
+        assert environment.environmentUri == env.environmentUri
+        assert (env_group.environmentUri, env_group.groupUri) == (env.environmentUri, pipeline1.SamlGroupName)
+        assert [e.envPipelineUri for e in development_environments] == [
+            f"{pipeline1.DataPipelineUri}{env.environmentUri}"
+        ]
+
+
+def test_get_stack_context_not_found(db, env):
+    with db.scoped_session() as session:
+        pipeline = models.DataPipeline(
+            label='noteam',
+            owner='me',
+            AwsAccountId=env.AwsAccountId,
+            region=env.region,
+            environmentUri=env.environmentUri,
+            repo='noteam',
+            SamlGroupName='not-an-environment-team',
+            devStrategy='trunk'
+        )
+        session.add(pipeline)
+        session.commit()
+
+        with pytest.raises(exceptions.ObjectNotFound) as e:
+            api.Pipeline.get_stack_context(session, pipeline.DataPipelineUri)
+        assert e.value.type == 'EnvironmentGroup'
+
+        with pytest.raises(exceptions.ObjectNotFound) as e:
+            api.Pipeline.get_stack_context(session, 'unknownpipelineuri')
+        assert e.value.type == 'Pipeline'
+
+        session.delete(pipeline)
+
+def test_write_ddk_json_multienvironment(tmp_path):
+    pipeline_environment = SimpleNamespace(AwsAccountId='111111111111', region='eu-west-1')
+    development_environments = [
+        SimpleNamespace(AwsAccountId='222222222222', region='eu-west-1', stage='dev', samlGroupName='team'),
+    ]
+
+    PipelineStack.write_ddk_json_multienvironment(
+        path=str(tmp_path),
+        output_file='ddk.json',
+        pipeline_environment=pipeline_environment,
+        development_environments=development_environments,
+    )
+
+    # Same bytes as the previously generated files, so unchanged pipelines do not get a new commit
+    content = (tmp_path / 'ddk.json').read_text()
+    assert content.endswith('}\n')
+    assert json.loads(content) == {
+        'environments': {
+            'cicd': {'account': '111111111111', 'region': 'eu-west-1', 'stage': 'cicd'},
+            'dev': {
+                'account': '222222222222',
+                'region': 'eu-west-1',
+                'stage': 'dev',
+                'env_vars': {'database': 'example_database', 'Team': 'team'},
+            },
+        }
+    }
+
+
+def test_zip_directory_reuses_cached_archive(tmp_path, mocker):
+    mocker.patch('dataall.cdkproxy.stacks.pipeline._ZIP_CACHE_DIR', str(tmp_path / 'cache'))
+    blueprint = tmp_path / 'blueprint'
+    (blueprint / 'app').mkdir(parents=True)
+    source = blueprint / 'app' / 'app.py'
+    source.write_text('print("hello")\n')
+
+    PipelineStack.zip_directory(str(blueprint))
+    first_archive = (blueprint / 'code.zip').read_bytes()
+    # A new checkout has new modification times, which are part of a freshly built archive
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+    PipelineStack.zip_directory(str(blueprint))
+
+    assert (blueprint / 'code.zip').read_bytes() == first_archive
+    assert os.stat(tmp_path / 'cache').st_mode & 0o077 == 0
+
+
+def test_zip_directory_rebuilds_changed_archive(tmp_path, mocker):
+    mocker.patch('dataall.cdkproxy.stacks.pipeline._ZIP_CACHE_DIR', str(tmp_path / 'cache'))
+    blueprint = tmp_path / 'blueprint'
+    (blueprint / 'app').mkdir(parents=True)
+    source = blueprint / 'app' / 'app.py'
+    source.write_text('print("hello")\n')
+
+    PipelineStack.zip_directory(str(blueprint))
+    first_archive = (blueprint / 'code.zip').read_bytes()
+    source.write_text('print("changed")\n')
+    PipelineStack.zip_directory(str(blueprint))
+
+    second_archive = (blueprint / 'code.zip').read_bytes()
+    assert second_archive != first_archive
+    with zipfile.ZipFile(blueprint / 'code.zip') as zf:
+        assert zf.read('app/app.py') == b'print("changed")\n'
+    assert (tmp_path / 'cache' / 'blueprint.zip').read_bytes() == second_archive
@@ -0,0 +1,303 @@
+from types import SimpleNamespace
+from typing import Callable
+
+import pytest
+from botocore.exceptions import ClientError
+
+from dataall.api import constants
+from dataall.aws.handlers.lakeformation import LakeFormation
+from dataall.aws.handlers.ram import Ram
+from dataall.aws.handlers.service_handlers import Worker
+from dataall.db import api, exceptions, models
+from dataall.tasks.data_sharing import data_sharing_service
+from dataall.tasks.data_sharing.share_managers import LFShareManager
+
+
+def _share(share_uri, dataset_uri, environment_uri, role_name):
+    return models.ShareObject(
+        shareUri=share_uri,
+        datasetUri=dataset_uri,
+        environmentUri=environment_uri,
+        principalIAMRoleName=role_name,
+        owner='alice',
+    )
+
+
+def test_group_dependent_shares():
+    shares = [
+        _share('s1', 'd1', 'e1', 'role1'),
+        _share('s2', 'd1', 'e2', 'role2'),
+        _share('s3', 'd2', 'e2', 'role2'),
+        _share('s4', 'd3', 'e3', 'role3'),
+        _share('s5', 'd4', 'e1', 'role4'),
+    ]
+
+    groups = data_sharing_service._group_dependent_shares(shares)
+
+    assert sorted(sorted(share.shareUri for share in group) for group in groups) == [
+        ['s1', 's2', 's3'],
+        ['s4'],
+        ['s5'],
+    ]
+
+
+def _client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'GrantPermissions')
+
+
+def test_retry_on_error_codes_retries_transient_errors(mocker):
+    sleep = mocker.patch('dataall.aws.handlers.service_handlers.time.sleep')
+    fn = mocker.MagicMock(
+        side_effect=[_client_error('ConcurrentModificationException'), _client_error('ThrottlingException'), True]
+    )
+
+    assert Worker.retry_on_error_codes(tries=3)(fn)('share-uri')
+    assert fn.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_retry_on_error_codes_raises_other_errors(mocker):
+    mocker.patch('dataall.aws.handlers.service_handlers.time.sleep')
+    fn = mocker.MagicMock(side_effect=_client_error('AccessDeniedException'))
+
+    with pytest.raises(ClientError):
+        Worker.retry_on_error_codes()(fn)('share-uri')
+    assert fn.call_count == 1
+
+
+def test_delete_lakeformation_v1_resource_shares(mocker):
+    pages = {
+        'list_resources': [
+            {'resources': [{'resourceShareArn': 'arn:v1-a'}, {'resourceShareArn': 'arn:v2'}]},
+            {
+                'resources': [
+                    {'resourceShareArn': 'arn:v1-b'},
+                    {'resourceShareArn': 'arn:other'},
+                    {'resourceShareArn': 'arn:v1-denied'},
+                ]
+            },
+        ],
+        'get_resource_shares': [
+            {
+                'resourceShares': [
+                    {'resourceShareArn': 'arn:v1-a', 'name': 'LakeFormation-123456789012-a'},
+                    {'resourceShareArn': 'arn:v2', 'name': 'LakeFormation-V2-123456789012'},
+                    {'resourceShareArn': 'arn:v1-global', 'name': 'LakeFormation-123456789012-global'},
+                ]
+            },
+            {
+                'resourceShares': [
+                    {'resourceShareArn': 'arn:v1-b', 'name': 'LakeFormation-123456789012-b'},
+                    {'resourceShareArn': 'arn:other', 'name': 'my-resource-share'},
+                    {'resourceShareArn': 'arn:v1-denied', 'name': 'LakeFormation-123456789012-denied'},
+                ]
+            },
+        ],
+    }
+    paginators = {
+        operation: mocker.MagicMock(paginate=mocker.MagicMock(return_value=iter(operation_pages)))
+        for operation, operation_pages in pages.items()
+    }
+    delete_errors = {
+        'arn:v1-a': [_client_error('ThrottlingException')],
+        'arn:v1-denied': [_client_error('AccessDeniedException')],
+    }
+
+    def delete_resource_share(resourceShareArn):
+        if delete_errors.get(resourceShareArn):
+            raise delete_errors[resourceShareArn].pop()
+        return {'returnValue': True}
+
+    mocker.patch('dataall.aws.handlers.service_handlers.time.sleep')
+    client = mocker.MagicMock()
+    client.get_paginator.side_effect = paginators.get
+    client.delete_resource_share.side_effect = delete_resource_share
+
+    Ram.delete_lakeformation_v1_resource_shares(client)
+
+    paginators['list_resources'].paginate.assert_called_once_with(
+        resourceOwner='SELF', resourceRegionScope='REGIONAL'
+    )
+    paginators['get_resource_shares'].paginate.assert_called_once_with(resourceOwner='SELF')
+    assert sorted(
+        call.kwargs['resourceShareArn'] for call in client.delete_resource_share.call_args_list
+    ) == ['arn:v1-a', 'arn:v1-a', 'arn:v1-b', 'arn:v1-denied']
+
+
+def test_batch_grant_pivot_role_database_permissions(mocker):
+    def batch_grant_permissions(CatalogId, Entries):
+        return {
+            'Failures': [
+                {'RequestEntry': entry, 'Error': {'ErrorCode': 'InvalidInputException'}}
+                for entry in Entries
+                if entry['Resource']['Database']['Name'] == 'db05'
+            ]
+        }
+
+    clients = {
+        '111111111111': mocker.MagicMock(**{'batch_grant_permissions.side_effect': batch_grant_permissions}),
+        '222222222222': mocker.MagicMock(
+            **{'batch_grant_permissions.side_effect': _client_error('AccessDeniedException')}
+        ),
+    }
+    mocker.patch(
+        'dataall.aws.handlers.sts.SessionHelper.remote_session',
+        side_effect=lambda accountid: mocker.MagicMock(**{'client.return_value': clients[accountid]}),
+    )
+    mocker.patch(
+        'dataall.aws.handlers.sts.SessionHelper.get_delegation_role_arn',
+        side_effect=lambda accountid: f'arn:aws:iam::{accountid}:role/dataallPivotRole',
+    )
+    databases = [('111111111111', 'eu-west-1', f'db{i:02}') for i in range(23)]
+    databases += [('222222222222', 'us-east-1', 'db00'), ('222222222222', 'us-east-1', 'db01')]
+
+    granted = LakeFormation.batch_grant_pivot_role_database_permissions(databases + databases[:2])
+
+    assert granted == set(databases[:23]) - {('111111111111', 'eu-west-1', 'db05')}
+    calls = clients['111111111111'].batch_grant_permissions.call_args_list
+    assert [[entry['Resource']['Database']['Name'] for entry in call.kwargs['Entries']] for call in calls] == [
+        [f'db{i:02}' for i in range(20)],
+        ['db20', 'db21', 'db22'],
+    ]
+    for call in calls:
+        assert call.kwargs['CatalogId'] == '111111111111'
+        for entry in call.kwargs['Entries']:
+            assert entry['Principal'] == {
+                'DataLakePrincipalIdentifier': 'arn:aws:iam::111111111111:role/dataallPivotRole'
+            }
+            assert entry['Permissions'] == ['ALL']
+    clients['222222222222'].batch_grant_permissions.assert_called_once()
+    assert clients['222222222222'].batch_grant_permissions.call_args.kwargs['CatalogId'] == '222222222222'
+
+
+@pytest.fixture(scope='module')
+def revoked_share(db, org: Callable, environment: Callable, dataset: Callable, table: Callable, group):
+    org1 = org(label='org', owner='alice', SamlGroupName='admins')
+    env = environment(
+        organization=org1,
+        awsAccountId='1' * 12,
+        label='environment',
+        owner=group.owner,
+        samlGroupName=group.name,
+        environmentDefaultIAMRoleName='dataall-environment-role',
+        dashboardsEnabled=True,
+    )
+    dataset1 = dataset(organization=org1, environment=env, label='dataset1')
+    table1 = table(dataset=dataset1, label='table1')
+    with db.scoped_session() as session:
+        session.add(
+            models.EnvironmentGroup(
+                environmentUri=env.environmentUri,
+                groupUri=group.name,
+                environmentIAMRoleArn=env.EnvironmentDefaultIAMRoleArn,
+                environmentIAMRoleName=env.EnvironmentDefaultIAMRoleName,
+                environmentAthenaWorkGroup='workgroup',
+            )
+        )
+        share = models.ShareObject(
+            datasetUri=dataset1.datasetUri,
+            environmentUri=env.environmentUri,
+            groupUri=group.name,
+            owner='bob',
+            principalId=group.name,
+            principalType=constants.PrincipalType.Group.value,
+            principalIAMRoleName=env.EnvironmentDefaultIAMRoleName,
+            status=constants.ShareObjectStatus.Revoked.value,
+        )
+        session.add(share)
+        session.commit()
+        share_item = models.ShareObjectItem(
+            shareUri=share.shareUri,
+            owner='alice',
+            itemUri=table1.tableUri,
+            itemType=constants.ShareableType.Table.value,
+            itemName=table1.name,
+            status=constants.ShareItemStatus.Revoke_Approved.value,
+        )
+        session.add(share_item)
+        session.commit()
+    yield share, share_item
+
+
+def test_get_share_data_core_matches_get_share_data(db, revoked_share):
+    share, _ = revoked_share
+    with db.scoped_session() as session:
+        orphan_share = models.ShareObject(
+            datasetUri=share.datasetUri,
+            environmentUri=share.environmentUri,
+            groupUri='team-not-in-environment',
+            owner='bob',
+            principalId='team-not-in-environment',
+            principalType=constants.PrincipalType.Group.value,
+            principalIAMRoleName=share.principalIAMRoleName,
+            status=constants.ShareObjectStatus.Approved.value,
+        )
+        session.add(orphan_share)
+        session.commit()
+
+        shares_data = api.ShareObject.get_share_data_core(
+            session, [share.shareUri, orphan_share.shareUri]
+        )
+
+        assert list(shares_data) == [share.shareUri]
+        orm_entities = api.ShareObject.get_share_data(session, share.shareUri)
+        for field, core_entity, orm_entity in zip(
+            api.ShareData._fields, shares_data[share.shareUri], orm_entities
+        ):
+            for column in type(orm_entity).__table__.c:
+                assert getattr(core_entity, column.key) == getattr(orm_entity, column.key), (
+                    f'{field}.{column.key}'
+                )
+
+        session.delete(orphan_share)
+
+
+def test_revoke_share_retries_transient_errors(db, revoked_share, mocker):
+    share, share_item = revoked_share
+    mocker.patch('dataall.aws.handlers.service_handlers.time.sleep')
+    mocker.patch(
+        'dataall.aws.handlers.quicksight.Quicksight.get_quicksight_client_in_identity_region',
+        return_value=mocker.MagicMock(),
+    )
+    describe_group = mocker.patch(
+        'dataall.aws.handlers.quicksight.Quicksight.describe_group',
+        side_effect=[_client_error('ThrottlingException'), {'Group': {'Arn': 'arn:aws:quicksight:group'}}],
+    )
+    for method in [
+        'check_share_item_exists_on_glue_catalog',
+        'revoke_table_resource_link_access',
+        'revoke_source_table_access',
+        'delete_resource_link_table',
+        'delete_shared_database',
+    ]:
+        mocker.patch.object(LFShareManager, method, return_value=True)
+
+    assert data_sharing_service.revoke_share(db, share.shareUri)
+
+    assert describe_group.call_count == 2
+    with db.scoped_session() as session:
+        assert (
+            session.query(models.ShareObjectItem).get(share_item.shareItemUri).status
+            == constants.ShareItemStatus.Revoke_Succeeded.value
+        )
+        assert (
+            session.query(models.ShareObject).get(share.shareUri).status
+            == constants.ShareObjectStatus.Processed.value
+        )
+
+
+def test_revoke_share_uses_current_share_status(db, revoked_share):
+    share, _ = revoked_share
+    with db.scoped_session() as session:
+        share_data = api.ShareObject.get_share_data_core(session, [share.shareUri])[share.shareUri]
+        current_status = session.query(models.ShareObject).get(share.shareUri).status
+    assert current_status != constants.ShareObjectStatus.Revoked.value
+    stale_share_data = share_data._replace(
+        share=SimpleNamespace(**{**vars(share_data.share), 'status': constants.ShareObjectStatus.Revoked.value})
+    )
+
+    with pytest.raises(exceptions.UnauthorizedOperation):
+        data_sharing_service.revoke_share(db, share.shareUri, stale_share_data)
+
+    with db.scoped_session() as session:
+        assert session.query(models.ShareObject).get(share.shareUri).status == current_status
@@ -232,6 +232,28 @@ def test_get_share_principals(
     assert processor_cross_account.get_share_principals() == [f"arn:aws:iam::{target_environment.AwsAccountId}:role/{share_cross_account.principalIAMRoleName}"]
 
 
+def test_grant_pivot_role_all_database_permissions_memoizes_success(
+        db,
+        processor_same_account: ProcessLFSameAccountShare,
+        mocker,
+):
+    # Given a first grant that fails
+    processor_same_account.granted_databases.clear()
+    lf_mock = mocker.patch(
+        "dataall.aws.handlers.lakeformation.LakeFormation.grant_pivot_role_all_database_permissions",
+        side_effect=[False, True],
+    )
+
+    # When
+    assert not processor_same_account.grant_pivot_role_all_database_permissions()
+    assert processor_same_account.grant_pivot_role_all_database_permissions()
+    assert processor_same_account.grant_pivot_role_all_database_permissions()
+
+    # Then the failed grant is retried and the successful one is not repeated
+    assert lf_mock.call_count == 2
+    processor_same_account.granted_databases.clear()
+
+
 def test_create_shared_database(
         db,
         processor_same_account: ProcessLFSameAccountShare,